@@ -8,6 +8,10 @@ Outputs into a target data directory:
   - devices.csv
   - events.jsonl (NDJSON)
 
+With --format csv the events are written as events.csv instead; with
+--format parquet or feather every table is written in that format
+(requires pyarrow).
+
 Notes:
   - All comments and strings are in English per project conventions.
   - Designed for local development; no external services required.
@@ -15,15 +19,37 @@ Notes:
 from __future__ import annotations
 
 import argparse
-import json
-import random
+import gzip
+import importlib.util
+import io
+import itertools
+import multiprocessing
+import multiprocessing.pool
+import os
+from collections import deque
 from dataclasses import dataclass
-from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List
+from typing import TYPE_CHECKING, Deque, Dict, Iterable, Iterator, List, TextIO, Tuple, Union
 
 import numpy as np
-import pandas as pd
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+__all__ = [
+    "EventBatch",
+    "GeneratorConfig",
+    "ensure_out",
+    "generate_devices",
+    "generate_events",
+    "generate_users",
+    "generate_videos",
+    "main",
+    "parse_args",
+    "write_events",
+    "write_outputs",
+    "write_table",
+]
 
 
 @dataclass
@@ -33,297 +59,115 @@ class GeneratorConfig:
     users: int = 300
     videos: int = 80
     seed: int = 42
+    format: str = "jsonl"
+    workers: int = 1
+    compress: str = "none"
+
+
+# Users per generated event batch; bounds peak memory of generate_events
+EVENT_BATCH_USERS = 2_000
+
+# Category tables for event attributes
+ACCOUNTS = np.array(["acct_1", "acct_2", "acct_3"])
+DEVICE_TYPES = np.array(["mobile", "tablet", "desktop"])
+DEVICE_OS_OPTIONS = np.array(["iOS", "Android", "Windows", "macOS"])
+APP_VERSIONS = np.array(["1.0.0", "1.1.0", "1.2.0", "2.0.0", "2.1.0"])
+NETWORK_TYPES = np.array(["wifi", "4G", "5G"])
+COUNTRIES = np.array(["US", "CA", "GB", "DE", "FR", "BR", "IN", "AU", "JP"])
+EVENT_NAMES = np.array(["first_login", "session_start", "watch_time", "like", "heart", "session_end"])
+EVENT_CODES = {name: code for code, name in enumerate(EVENT_NAMES)}
+LIKE_CODES = np.array([EVENT_CODES["like"], EVENT_CODES["heart"]], dtype=np.int8)
+
+# Decimal text of every IP octet, so addresses are built by table lookup
+OCTETS = np.array([str(i) for i in range(256)])
+
+# Low-cardinality event columns are stored as int8 codes into these tables
+EVENT_CATEGORIES = {
+    "account_id": ACCOUNTS,
+    "event_name": EVENT_NAMES,
+    "device": DEVICE_TYPES,
+    "device_os": DEVICE_OS_OPTIONS,
+    "app_version": APP_VERSIONS,
+    "network_type": NETWORK_TYPES,
+    "country": COUNTRIES,
+}
+
+# Output format -> (extension for users/videos/devices, extension for events)
+OUTPUT_EXTENSIONS = {
+    "jsonl": ("csv", "jsonl"),
+    "csv": ("csv", "csv"),
+    "parquet": ("parquet", "parquet"),
+    "feather": ("feather", "feather"),
+}
+
+# Streaming compression for text event files -> file name suffix
+COMPRESS_SUFFIXES = {"none": "", "gzip": ".gz", "zstd": ".zst"}
+
+# Fields that vary per event, then fields fixed for the whole session
+EVENT_FIELDS = ["timestamp", "video_id", "event_name", "value"]
+SESSION_FIELDS = [
+    "account_id",
+    "user_id",
+    "session_id",
+    "device",
+    "device_os",
+    "app_version",
+    "network_type",
+    "ip",
+    "country",
+]
+EVENT_COLUMNS = EVENT_FIELDS + SESSION_FIELDS
+
+# Sentinel for a null event value; real values are always >= 1
+NULL_VALUE = -1
+
+# Fixed events.jsonl schema. Every string field comes from a safe-ASCII
+# table or id pattern, so values are interpolated without JSON escaping.
+# Each line is the per-event prefix followed by its session's suffix,
+# which is formatted once per session.
+EVENT_LINE = '{{"timestamp":"{}","video_id":{},"event_name":"{}","value":{}{}'.format
+SESSION_SUFFIX = (
+    ',"account_id":"{}","user_id":"{}","session_id":"{}","device":"{}","device_os":"{}",'
+    '"app_version":"{}","network_type":"{}","ip":"{}","country":"{}"}}\n'
+).format
+EVENT_CSV_LINE = (",".join(["{}"] * len(EVENT_FIELDS)) + "{}").format
+SESSION_CSV_SUFFIX = ("," + ",".join(["{}"] * len(SESSION_FIELDS)) + "\n").format
 
 
-def ensure_out(out_dir: Path) -> None:
-    out_dir.mkdir(parents=True, exist_ok=True)
-
-
-def generate_users(cfg: GeneratorConfig) -> pd.DataFrame:
-    today = datetime.utcnow().date()
-    users: List[List[str]] = []
-    for i in range(cfg.users):
-        user_id = f"u_{i:05d}"
-        signup_date = today - timedelta(days=random.randint(1, cfg.days + 7))
-        subscription_tier = random.choice(["free", "basic", "premium"])
-        age_group = random.choice(["18-24", "25-34", "35-44", "45-54", "55+"])
-        gender = random.choice(["female", "male", "other", "prefer_not_to_say"])
-        users.append([user_id, str(signup_date), subscription_tier, age_group, gender])
-    return pd.DataFrame(
-        users, columns=["user_id", "signup_date", "subscription_tier", "age_group", "gender"]
-    )
-
-
-def generate_videos(cfg: GeneratorConfig) -> pd.DataFrame:
-    genres = [
-        "drama",
-        "comedy",
-        "documentary",
-        "action",
-        "horror",
-        "sci-fi",
-        "fantasy",
-        "romance",
-    ]
-    videos: List[List[object]] = []
-    for i in range(cfg.videos):
-        video_id = f"v_{i:05d}"
-        title = f"Video {i}"
-        genre = random.choice(genres)
-        duration_seconds = random.randint(30, 3600)
-        patent_id = f"pat_{random.randint(1000, 9999)}"
-        videos.append([video_id, title, genre, duration_seconds, patent_id])
-    return pd.DataFrame(
-        videos, columns=["video_id", "title", "genre", "duration_seconds", "patent_id"]
-    )
-
-
-def generate_devices() -> pd.DataFrame:
-    rows: List[List[str]] = []
-    device_types = ["mobile", "tablet", "desktop"]
-    device_models = ["A1", "A2", "B1", "B2", "C1"]
-    os_versions = ["iOS 16", "Android 13", "Windows 11", "macOS 14"]
-    for d in device_types:
-        for m in device_models:
-            for o in os_versions:
-                rows.append([d, m, o])
-    return pd.DataFrame(rows, columns=["device", "device_model", "os_version"])
-
-
-def generate_events(cfg: GeneratorConfig, users_df: pd.DataFrame, videos_df: pd.DataFrame) -> List[dict]:
-    accounts = ["acct_1", "acct_2", "acct_3"]
-    device_types = ["mobile", "tablet", "desktop"]
-    device_os_options = ["iOS", "Android", "Windows", "macOS"]
-    app_versions = ["1.0.0", "1.1.0", "1.2.0", "2.0.0", "2.1.0"]
-    network_types = ["wifi", "4G", "5G"]
-    countries = ["US", "CA", "GB", "DE", "FR", "BR", "IN", "AU", "JP"]
-
-    base_dt = datetime.utcnow() - timedelta(days=cfg.days)
-    rows: List[dict] = []
-
-    user_ids = users_df["user_id"].tolist()
-    video_ids = videos_df["video_id"].tolist()
-
-    for user_id in user_ids:
-        # Draw sessions per user across the window, at least 1
-        num_sessions = np.random.poisson(lam=1.8) + 1
-        session_time = base_dt + timedelta(hours=random.randint(0, cfg.days * 24))
-        first_login_emitted = False
-
-        for s in range(num_sessions):
-            account_id = random.choice(accounts)
-            session_id = f"s_{user_id}_{s:04d}"
-            device = random.choice(device_types)
-            device_os = random.choice(device_os_options)
-            app_version = random.choice(app_versions)
-            network_type = random.choice(network_types)
-            ip = f"10.{random.randint(0,255)}.{random.randint(0,255)}.{random.randint(1,254)}"
-            country = random.choice(countries)
-
-            if not first_login_emitted:
-                rows.append({
-                    "timestamp": (session_time - timedelta(minutes=5)).isoformat(),
-                    "account_id": account_id,
-                    "user_id": user_id,
-                    "video_id": None,
-                    "session_id": session_id,
-                    "event_name": "first_login",
-                    "value": None,
-                    "device": device,
-                    "device_os": device_os,
-                    "app_version": app_version,
-                    "network_type": network_type,
-                    "ip": ip,
-                    "country": country,
-                })
-                first_login_emitted = True
-
-            rows.append({
-                "timestamp": session_time.isoformat(),
-                "account_id": account_id,
-                "user_id": user_id,
-                "video_id": None,
-                "session_id": session_id,
-                "event_name": "session_start",
-                "value": None,
-                "device": device,
-                "device_os": device_os,
-                "app_version": app_version,
-                "network_type": network_type,
-                "ip": ip,
-                "country": country,
-            })
-
-            # Simulate watch_time chunks
-            session_watch_seconds = 0
-            num_chunks = random.randint(1, 10)
-            t = session_time
-            watched_videos = random.sample(video_ids, k=min(len(video_ids), random.randint(1, 4)))
-            for _ in range(num_chunks):
-                t += timedelta(seconds=random.randint(1, 50))
-                value = int(np.random.exponential(scale=12)) + 1  # skewed distribution
-                session_watch_seconds += value
-                rows.append({
-                    "timestamp": t.isoformat(),
-                    "account_id": account_id,
-                    "user_id": user_id,
-                    "video_id": random.choice(watched_videos),
-                    "session_id": session_id,
-                    "event_name": "watch_time",
-                    "value": value,
-                    "device": device,
-                    "device_os": device_os,
-                    "app_version": app_version,
-                    "network_type": network_type,
-                    "ip": ip,
-                    "country": country,
-                })
-
-                if random.random() < 0.12:
-                    rows.append({
-                        "timestamp": (t + timedelta(seconds=1)).isoformat(),
-                        "account_id": account_id,
-                        "user_id": user_id,
-                        "video_id": random.choice(watched_videos),
-                        "session_id": session_id,
-                        "event_name": random.choice(["like", "heart"]),
-                        "value": None,
-                        "device": device,
-                        "device_os": device_os,
-                        "app_version": app_version,
-                        "network_type": network_type,
-                        "ip": ip,
-                        "country": country,
-                    })
-
-            end_time = session_time + timedelta(seconds=session_watch_seconds + random.randint(0, 60))
-            rows.append({
-                "timestamp": end_time.isoformat(),
-                "account_id": account_id,
-                "user_id": user_id,
-                "video_id": None,
-                "session_id": session_id,
-                "event_name": "session_end",
-                "value": None,
-                "device": device,
-                "device_os": device_os,
-                "app_version": app_version,
-                "network_type": network_type,
-                "ip": ip,
-                "country": country,
-            })
-
-            session_time = end_time + timedelta(minutes=random.randint(10, 600))
-
-    return rows
-
-
-def write_outputs(cfg: GeneratorConfig) -> None:
-    random.seed(cfg.seed)
-    np.random.seed(cfg.seed)
-    ensure_out(cfg.out_dir)
-
-    users_df = generate_users(cfg)
-    videos_df = generate_videos(cfg)
-    devices_df = generate_devices()
-    events = generate_events(cfg, users_df, videos_df)
-
-    users_df.to_csv(cfg.out_dir / "users.csv", index=False)
-    videos_df.to_csv(cfg.out_dir / "videos.csv", index=False)
-    devices_df.to_csv(cfg.out_dir / "devices.csv", index=False)
-
-    events_path = cfg.out_dir / "events.jsonl"
-    with open(events_path, "w", encoding="utf-8") as f:
-        for row in events:
-            f.write(json.dumps(row) + "\n")
-
-    print(f"Wrote: {events_path}")
-    print(f"Wrote: {cfg.out_dir / 'users.csv'}")
-    print(f"Wrote: {cfg.out_dir / 'videos.csv'}")
-    print(f"Wrote: {cfg.out_dir / 'devices.csv'}")
-
-
-def parse_args() -> GeneratorConfig:
-    parser = argparse.ArgumentParser(description="Generate StreamPro synthetic dataset")
-    parser.add_argument(
-        "--out-dir",
-        type=str,
-        default=str(Path(__file__).resolve().parents[1] / "data"),
-        help="Output directory for data files",
-    )
-    parser.add_argument("--days", type=int, default=7, help="Number of days to span events over")
-    parser.add_argument("--users", type=int, default=300, help="Number of users to generate")
-    parser.add_argument("--videos", type=int, default=80, help="Number of videos to generate")
-    parser.add_argument("--seed", type=int, default=42, help="Random seed")
-    args = parser.parse_args()
-    return GeneratorConfig(out_dir=Path(args.out_dir), days=args.days, users=args.users, videos=args.videos, seed=args.seed)
-
-
-def main() -> None:
-    cfg = parse_args()
-    write_outputs(cfg)
-
-
-if __name__ == "__main__":
-    main()
-
-#!/usr/bin/env python3
-"""
-StreamPro synthetic data generator.
-
-Outputs into a target data directory:
-  - users.csv
-  - videos.csv
-  - devices.csv
-  - events.jsonl (NDJSON)
-
-Notes:
-  - All comments and strings are in English per project conventions.
-  - Designed for local development; no external services required.
-"""
-from __future__ import annotations
-
-import argparse
-import json
-import random
-from dataclasses import dataclass
-from datetime import datetime, timedelta
-from pathlib import Path
-from typing import List, Optional
-
-import numpy as np
-import pandas as pd
+@dataclass
+class EventBatch:
+    # Per-event columns, and the index of each event's session
+    events: Dict[str, np.ndarray]
+    session: np.ndarray
+    # Per-session columns
+    sessions: Dict[str, np.ndarray]
 
+    def __len__(self) -> int:
+        return len(self.session)
 
-@dataclass
-class GeneratorConfig:
-    out_dir: Path
-    days: int = 7
-    users: int = 300
-    videos: int = 80
-    seed: int = 42
+    def column(self, name: str) -> np.ndarray:
+        if name in self.events:
+            return self.events[name]
+        return self.sessions[name][self.session]
 
 
 def ensure_out(out_dir: Path) -> None:
     out_dir.mkdir(parents=True, exist_ok=True)
 
 
-def generate_users(cfg: GeneratorConfig) -> pd.DataFrame:
-    today = datetime.utcnow().date()
-    users: List[List[str]] = []
-    for i in range(cfg.users):
-        user_id = f"u_{i:05d}"
-        signup_date = today - timedelta(days=random.randint(1, cfg.days + 7))
-        subscription_tier = random.choice(["free", "basic", "premium"])
-        age_group = random.choice(["18-24", "25-34", "35-44", "45-54", "55+"])
-        gender = random.choice(["female", "male", "other", "prefer_not_to_say"])
-        users.append([user_id, str(signup_date), subscription_tier, age_group, gender])
-    return pd.DataFrame(
-        users, columns=["user_id", "signup_date", "subscription_tier", "age_group", "gender"]
-    )
+def generate_users(cfg: GeneratorConfig, rng: np.random.Generator) -> Dict[str, np.ndarray]:
+    today = np.datetime64("now", "D")  # UTC date; "today" would be local
+    offsets = rng.integers(1, cfg.days + 8, size=cfg.users)
+    return {
+        "user_id": np.array([f"u_{i:05d}" for i in range(cfg.users)], dtype=str),
+        "signup_date": (today - offsets.astype("timedelta64[D]")).astype(str),
+        "subscription_tier": rng.choice(["free", "basic", "premium"], size=cfg.users),
+        "age_group": rng.choice(["18-24", "25-34", "35-44", "45-54", "55+"], size=cfg.users),
+        "gender": rng.choice(["female", "male", "other", "prefer_not_to_say"], size=cfg.users),
+    }
 
 
-def generate_videos(cfg: GeneratorConfig) -> pd.DataFrame:
+def generate_videos(cfg: GeneratorConfig, rng: np.random.Generator) -> Dict[str, np.ndarray]:
     genres = [
         "drama",
         "comedy",
@@ -334,182 +178,368 @@ def generate_videos(cfg: GeneratorConfig) -> pd.DataFrame:
         "fantasy",
         "romance",
     ]
-    videos: List[List[object]] = []
-    for i in range(cfg.videos):
-        video_id = f"v_{i:05d}"
-        title = f"Video {i}"
-        genre = random.choice(genres)
-        duration_seconds = random.randint(30, 3600)
-        patent_id = f"pat_{random.randint(1000, 9999)}"
-        videos.append([video_id, title, genre, duration_seconds, patent_id])
-    return pd.DataFrame(
-        videos, columns=["video_id", "title", "genre", "duration_seconds", "patent_id"]
-    )
+    return {
+        "video_id": np.array([f"v_{i:05d}" for i in range(cfg.videos)], dtype=str),
+        "title": np.array([f"Video {i}" for i in range(cfg.videos)], dtype=str),
+        "genre": rng.choice(genres, size=cfg.videos),
+        "duration_seconds": rng.integers(30, 3601, size=cfg.videos),
+        "patent_id": np.char.add("pat_", rng.integers(1000, 10000, size=cfg.videos).astype(str)),
+    }
 
 
-def generate_devices() -> pd.DataFrame:
-    rows: List[List[str]] = []
+def generate_devices() -> Dict[str, List[str]]:
     device_types = ["mobile", "tablet", "desktop"]
     device_models = ["A1", "A2", "B1", "B2", "C1"]
     os_versions = ["iOS 16", "Android 13", "Windows 11", "macOS 14"]
-    for d in device_types:
-        for m in device_models:
-            for o in os_versions:
-                rows.append([d, m, o])
-    return pd.DataFrame(rows, columns=["device", "device_model", "os_version"])
-
-
-def generate_events(cfg: GeneratorConfig, users_df: pd.DataFrame, videos_df: pd.DataFrame) -> List[dict]:
-    accounts = ["acct_1", "acct_2", "acct_3"]
-    device_types = ["mobile", "tablet", "desktop"]
-    device_os_options = ["iOS", "Android", "Windows", "macOS"]
-    app_versions = ["1.0.0", "1.1.0", "1.2.0", "2.0.0", "2.1.0"]
-    network_types = ["wifi", "4G", "5G"]
-    countries = ["US", "CA", "GB", "DE", "FR", "BR", "IN", "AU", "JP"]
-
-    base_dt = datetime.utcnow() - timedelta(days=cfg.days)
-    rows: List[dict] = []
-
-    user_ids = users_df["user_id"].tolist()
-    video_ids = videos_df["video_id"].tolist()
-
-    for user_id in user_ids:
-        # draw sessions per user across the window, at least 1
-        num_sessions = np.random.poisson(lam=1.8) + 1
-        session_time = base_dt + timedelta(hours=random.randint(0, cfg.days * 24))
-        first_login_emitted = False
-
-        for s in range(num_sessions):
-            account_id = random.choice(accounts)
-            session_id = f"s_{user_id}_{s:04d}"
-            device = random.choice(device_types)
-            device_os = random.choice(device_os_options)
-            app_version = random.choice(app_versions)
-            network_type = random.choice(network_types)
-            ip = f"10.{random.randint(0,255)}.{random.randint(0,255)}.{random.randint(1,254)}"
-            country = random.choice(countries)
-
-            if not first_login_emitted:
-                rows.append({
-                    "timestamp": (session_time - timedelta(minutes=5)).isoformat(),
-                    "account_id": account_id,
-                    "user_id": user_id,
-                    "video_id": None,
-                    "session_id": session_id,
-                    "event_name": "first_login",
-                    "value": None,
-                    "device": device,
-                    "device_os": device_os,
-                    "app_version": app_version,
-                    "network_type": network_type,
-                    "ip": ip,
-                    "country": country,
-                })
-                first_login_emitted = True
-
-            rows.append({
-                "timestamp": session_time.isoformat(),
-                "account_id": account_id,
-                "user_id": user_id,
-                "video_id": None,
-                "session_id": session_id,
-                "event_name": "session_start",
-                "value": None,
-                "device": device,
-                "device_os": device_os,
-                "app_version": app_version,
-                "network_type": network_type,
-                "ip": ip,
-                "country": country,
-            })
-
-            # simulate watch_time chunks
-            session_watch_seconds = 0
-            num_chunks = random.randint(1, 10)
-            t = session_time
-            watched_videos = random.sample(video_ids, k=min(len(video_ids), random.randint(1, 4)))
-            for _ in range(num_chunks):
-                t += timedelta(seconds=random.randint(1, 50))
-                value = int(np.random.exponential(scale=12)) + 1  # skewed distribution
-                session_watch_seconds += value
-                rows.append({
-                    "timestamp": t.isoformat(),
-                    "account_id": account_id,
-                    "user_id": user_id,
-                    "video_id": random.choice(watched_videos),
-                    "session_id": session_id,
-                    "event_name": "watch_time",
-                    "value": value,
-                    "device": device,
-                    "device_os": device_os,
-                    "app_version": app_version,
-                    "network_type": network_type,
-                    "ip": ip,
-                    "country": country,
-                })
-
-                if random.random() < 0.12:
-                    rows.append({
-                        "timestamp": (t + timedelta(seconds=1)).isoformat(),
-                        "account_id": account_id,
-                        "user_id": user_id,
-                        "video_id": random.choice(watched_videos),
-                        "session_id": session_id,
-                        "event_name": random.choice(["like", "heart"]),
-                        "value": None,
-                        "device": device,
-                        "device_os": device_os,
-                        "app_version": app_version,
-                        "network_type": network_type,
-                        "ip": ip,
-                        "country": country,
-                    })
-
-            end_time = session_time + timedelta(seconds=session_watch_seconds + random.randint(0, 60))
-            rows.append({
-                "timestamp": end_time.isoformat(),
-                "account_id": account_id,
-                "user_id": user_id,
-                "video_id": None,
-                "session_id": session_id,
-                "event_name": "session_end",
-                "value": None,
-                "device": device,
-                "device_os": device_os,
-                "app_version": app_version,
-                "network_type": network_type,
-                "ip": ip,
-                "country": country,
-            })
-
-            session_time = end_time + timedelta(minutes=random.randint(10, 600))
-
-    return rows
+    devices: Dict[str, List[str]] = {"device": [], "device_model": [], "os_version": []}
+    for d, m, o in itertools.product(device_types, device_models, os_versions):
+        devices["device"].append(d)
+        devices["device_model"].append(m)
+        devices["os_version"].append(o)
+    return devices
+
+
+def _concat(*parts: object) -> np.ndarray:
+    # Element-wise string concatenation of arrays and scalars
+    out = np.asarray(parts[0], dtype=str)
+    for part in parts[1:]:
+        out = np.char.add(out, np.asarray(part, dtype=str))
+    return out
+
+
+def _draw_codes(rng: np.random.Generator, table: np.ndarray, n: int) -> np.ndarray:
+    # n uniform int8 codes into a category table in one call
+    return rng.integers(0, len(table), n, dtype=np.int8)
+
+
+def _segment_cumsum(values: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    # Inclusive cumulative sum restarting at every segment boundary
+    total = np.cumsum(values)
+    starts = np.cumsum(lengths) - lengths
+    return total - np.repeat(total[starts] - values[starts], lengths)
+
+
+def _sample_distinct(rng: np.random.Generator, n: int, k: int, rows: int) -> np.ndarray:
+    # Per row, k distinct indices from range(n) without an (rows x n) matrix
+    picked = np.empty((rows, k), dtype=np.int32)
+    for j in range(k):
+        draw = rng.integers(0, n - j, rows, dtype=np.int32)
+        # Shift past already-picked indices, smallest first
+        for c in np.sort(picked[:, :j], axis=1).T:
+            draw += draw >= c
+        picked[:, j] = draw
+    return picked
+
+
+def _event_batch(
+    cfg: GeneratorConfig,
+    user_ids: np.ndarray,
+    video_ids: np.ndarray,
+    base_dt: np.datetime64,
+    rng: np.random.Generator,
+) -> EventBatch:
+    # Draw sessions per user across the window, at least 1
+    sessions_per_user = rng.poisson(1.8, len(user_ids)) + 1
+    total_sessions = int(sessions_per_user.sum())
+    session_user = np.repeat(user_ids, sessions_per_user)
+    session_number = _segment_cumsum(np.ones(total_sessions, dtype=np.int64), sessions_per_user) - 1
+
+    # Per-session attributes, one array per column
+    account_id = _draw_codes(rng, ACCOUNTS, total_sessions)
+    session_id = _concat("s_", session_user, "_", np.char.zfill(session_number.astype(str), 4))
+    device = _draw_codes(rng, DEVICE_TYPES, total_sessions)
+    device_os = _draw_codes(rng, DEVICE_OS_OPTIONS, total_sessions)
+    app_version = _draw_codes(rng, APP_VERSIONS, total_sessions)
+    network_type = _draw_codes(rng, NETWORK_TYPES, total_sessions)
+    octets = rng.integers([0, 0, 1], [256, 256, 255], size=(total_sessions, 3))
+    ip = _concat("10.", OCTETS[octets[:, 0]], ".", OCTETS[octets[:, 1]], ".", OCTETS[octets[:, 2]])
+    country = _draw_codes(rng, COUNTRIES, total_sessions)
+
+    # Simulate watch_time chunks
+    chunks_per_session = rng.integers(1, 11, total_sessions)
+    total_chunks = int(chunks_per_session.sum())
+    chunk_session = np.repeat(np.arange(total_sessions), chunks_per_session)
+    chunk_number = _segment_cumsum(np.ones(total_chunks, dtype=np.int64), chunks_per_session) - 1
+    chunk_offset = _segment_cumsum(rng.integers(1, 51, total_chunks), chunks_per_session)
+    values = rng.exponential(12.0, total_chunks).astype(np.int64) + 1  # skewed distribution
+
+    # Each session watches a few distinct videos; chunks pick among them
+    watched_count = np.minimum(len(video_ids), rng.integers(1, 5, total_sessions))
+    watched = _sample_distinct(rng, len(video_ids), min(len(video_ids), 4), total_sessions)
+    pick = (rng.random(total_chunks) * watched_count[chunk_session]).astype(np.int64)
+    chunk_video = video_ids[watched[chunk_session, pick]]
+
+    liked = rng.random(total_chunks) < 0.12
+    like_session = chunk_session[liked]
+    like_pick = (rng.random(len(like_session)) * watched_count[like_session]).astype(np.int64)
+    like_video = video_ids[watched[like_session, like_pick]]
+    like_name = LIKE_CODES[rng.integers(0, len(LIKE_CODES), len(like_session))]
+
+    # Session timing in seconds from base_dt; the next session starts after a gap
+    session_watch_seconds = np.add.reduceat(values, np.cumsum(chunks_per_session) - chunks_per_session)
+    end_offset = session_watch_seconds + rng.integers(0, 61, total_sessions)
+    gap = rng.integers(10, 601, total_sessions) * 60
+    user_start = rng.integers(0, cfg.days * 24 + 1, len(user_ids)) * 3600
+    advance = end_offset + gap
+    session_start = (
+        np.repeat(user_start, sessions_per_user)
+        + _segment_cumsum(advance, sessions_per_user)
+        - advance
+    )
+    first_sessions = np.flatnonzero(session_number == 0)
+
+    # Assemble event blocks; (session, position) restores per-session event order
+    no_video = np.full(total_sessions, "")
+    no_value = np.full(total_sessions, NULL_VALUE)
+    blocks = [
+        # first_login, session_start, watch_time, like/heart, session_end
+        (first_sessions, session_start[first_sessions] - 300, 0, EVENT_CODES["first_login"],
+         no_video[first_sessions], no_value[first_sessions]),
+        (np.arange(total_sessions), session_start, 1, EVENT_CODES["session_start"], no_video, no_value),
+        (chunk_session, session_start[chunk_session] + chunk_offset, 2 + 2 * chunk_number,
+         EVENT_CODES["watch_time"], chunk_video, values),
+        (like_session, session_start[like_session] + chunk_offset[liked] + 1, 3 + 2 * chunk_number[liked],
+         like_name, like_video, no_value[like_session]),
+        (np.arange(total_sessions), session_start + end_offset, 2 + 2 * chunks_per_session,
+         EVENT_CODES["session_end"], no_video, no_value),
+    ]
+    sess = np.concatenate([b[0] for b in blocks])
+    position = np.concatenate([np.broadcast_to(b[2], len(b[0])) for b in blocks])
+    order = np.lexsort((position, sess))
+    sess = sess[order]
+
+    offsets = np.concatenate([b[1] for b in blocks])[order]
+    event_name = np.concatenate([np.broadcast_to(b[3], len(b[0])).astype(np.int8) for b in blocks])[order]
+    video = np.concatenate([b[4] for b in blocks])[order]
+    value = np.concatenate([b[5] for b in blocks])[order]
+
+    events = {
+        "timestamp": base_dt + offsets.astype("timedelta64[s]"),
+        "video_id": video,
+        "event_name": event_name,
+        "value": value,
+    }
+    sessions = {
+        "account_id": account_id,
+        "user_id": session_user,
+        "session_id": session_id,
+        "device": device,
+        "device_os": device_os,
+        "app_version": app_version,
+        "network_type": network_type,
+        "ip": ip,
+        "country": country,
+    }
+    return EventBatch(events=events, session=sess, sessions=sessions)
+
+
+def _text_columns(columns: Dict[str, np.ndarray], names: List[str]) -> List[list]:
+    out = []
+    for name in names:
+        if name in EVENT_CATEGORIES:
+            # Decode codes through the tiny table so rows share its str objects
+            out.append(list(map(EVENT_CATEGORIES[name].tolist().__getitem__, columns[name].tolist())))
+        else:
+            out.append(columns[name].tolist())
+    return out
+
+
+def _encode_events(batch: EventBatch, csv: bool = False) -> str:
+    # Nullable fields are turned into text up front; the rest is the fixed template
+    video = batch.events["video_id"]
+    value = batch.events["value"]
+    if csv:
+        template, suffix_template = EVENT_CSV_LINE, SESSION_CSV_SUFFIX
+        video_text = video
+        value_text = np.where(value == NULL_VALUE, "", value.astype(str))
+    else:
+        template, suffix_template = EVENT_LINE, SESSION_SUFFIX
+        video_text = np.where(video == "", "null", _concat('"', video, '"'))
+        value_text = np.where(value == NULL_VALUE, "null", value.astype(str))
+    events = {
+        **batch.events,
+        "timestamp": batch.events["timestamp"].astype("<U19"),
+        "video_id": video_text,
+        "value": value_text,
+    }
+    suffixes = list(map(suffix_template, *_text_columns(batch.sessions, SESSION_FIELDS)))
+    return "".join(map(
+        template,
+        *_text_columns(events, EVENT_FIELDS),
+        map(suffixes.__getitem__, batch.session.tolist()),
+    ))
+
+
+def _arrow_event_schema() -> pa.Schema:
+    import pyarrow as pa
+
+    fields = []
+    for name in EVENT_COLUMNS:
+        if name in EVENT_CATEGORIES:
+            fields.append(pa.field(name, pa.dictionary(pa.int8(), pa.string())))
+        elif name == "timestamp":
+            fields.append(pa.field(name, pa.timestamp("s")))
+        elif name == "value":
+            fields.append(pa.field(name, pa.int64()))
+        else:
+            fields.append(pa.field(name, pa.string()))
+    return pa.schema(fields)
+
+
+def _arrow_events(batch: EventBatch) -> pa.Table:
+    import pyarrow as pa
+
+    columns = {}
+    for name in EVENT_COLUMNS:
+        column = batch.column(name)
+        if name in EVENT_CATEGORIES:
+            columns[name] = pa.DictionaryArray.from_arrays(column, EVENT_CATEGORIES[name].tolist())
+        elif name == "video_id":
+            columns[name] = pa.array(column, mask=column == "")
+        elif name == "value":
+            columns[name] = pa.array(column, mask=column == NULL_VALUE)
+        else:
+            columns[name] = column
+    return pa.table(columns, schema=_arrow_event_schema())
+
+
+def _generate_part(
+    task: Tuple[GeneratorConfig, np.ndarray, np.ndarray, np.datetime64, np.random.SeedSequence],
+) -> Tuple[Union[str, pa.Table], int]:
+    # One user batch, generated and encoded for cfg.format; runs in worker processes
+    cfg, user_ids, video_ids, base_dt, seed = task
+    batch = _event_batch(cfg, user_ids, video_ids, base_dt, np.random.default_rng(seed))
+    if cfg.format in ("parquet", "feather"):
+        return _arrow_events(batch), len(batch)
+    return _encode_events(batch, csv=cfg.format == "csv"), len(batch)
+
+
+def generate_events(
+    cfg: GeneratorConfig,
+    users: Dict[str, np.ndarray],
+    videos: Dict[str, np.ndarray],
+) -> Iterator[Tuple[Union[str, pa.Table], int]]:
+    # Event times are whole seconds from base_dt, so second resolution is exact
+    base_dt = np.datetime64("now", "s") - np.timedelta64(cfg.days, "D")  # UTC
+
+    user_ids = np.asarray(users["user_id"], dtype=str)
+    video_ids = np.asarray(videos["video_id"], dtype=str)
+
+    # Users are processed in batches so memory is bounded by the batch, not the
+    # dataset. Each batch has its own seed, so output does not depend on workers.
+    starts = range(0, len(user_ids), EVENT_BATCH_USERS)
+    seeds = np.random.SeedSequence(cfg.seed).spawn(len(starts))
+    tasks = [
+        (cfg, user_ids[start:start + EVENT_BATCH_USERS], video_ids, base_dt, seed)
+        for start, seed in zip(starts, seeds)
+    ]
+    workers = min(cfg.workers, len(tasks))
+    if workers <= 1:
+        yield from map(_generate_part, tasks)
+        return
+    with multiprocessing.Pool(workers) as pool:
+        # Keep at most 2 x workers batches in flight, so a slow writer holds
+        # the workers back instead of letting finished batches pile up
+        pending: Deque[multiprocessing.pool.AsyncResult] = deque()
+        for task in tasks:
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().get()
+            pending.append(pool.apply_async(_generate_part, (task,)))
+        while pending:
+            yield pending.popleft().get()
+
+
+def _open_text(path: Path, compress: str) -> TextIO:
+    if compress == "gzip":
+        return gzip.open(path, "wt", encoding="utf-8", compresslevel=6)
+    if compress == "zstd":
+        import zstandard
+
+        cctx = zstandard.ZstdCompressor(level=3, threads=-1)
+        return io.TextIOWrapper(cctx.stream_writer(open(path, "wb")), encoding="utf-8")
+    return open(path, "w", encoding="utf-8", buffering=1 << 20)
+
+
+def write_events(
+    parts: Iterable[Tuple[Union[str, pa.Table], int]],
+    path: Path,
+    fmt: str,
+    compress: str = "none",
+) -> int:
+    written = 0
+    if fmt in ("parquet", "feather"):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        # Open the writer from the fixed schema so zero batches still give a valid file
+        schema = _arrow_event_schema()
+        if fmt == "parquet":
+            writer = pq.ParquetWriter(path, schema, compression="zstd")
+        else:
+            # Feather v2 is the Arrow IPC file format; write it batch by batch
+            writer = pa.ipc.new_file(path, schema, options=pa.ipc.IpcWriteOptions(compression="lz4"))
+        with writer:
+            for table, count in parts:
+                writer.write_table(table)
+                written += count
+        return written
+
+    with _open_text(path, compress) as f:
+        if fmt == "csv":
+            f.write(",".join(EVENT_COLUMNS) + "\n")
+        for text, count in parts:
+            f.write(text)
+            written += count
+    return written
+
+
+def _write_csv(columns: Dict[str, list], path: Path) -> None:
+    # Dimension values are plain ASCII without commas or quotes; no quoting needed
+    line = (",".join(["{}"] * len(columns)) + "\n").format
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(",".join(columns) + "\n")
+        f.write("".join(map(line, *columns.values())))
+
+
+def write_table(table: Dict[str, Union[np.ndarray, List[str]]], path: Path, fmt: str) -> None:
+    if fmt in ("parquet", "feather"):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        from pyarrow import feather
+
+        # Column arrays go straight to Arrow's C++ writers
+        arrow_table = pa.table({name: np.asarray(column) for name, column in table.items()})
+        if fmt == "parquet":
+            pq.write_table(arrow_table, path, compression="zstd")
+        else:
+            feather.write_feather(arrow_table, path, compression="lz4")
+    else:
+        _write_csv({name: np.asarray(table[name]).tolist() for name in table}, path)
 
 
 def write_outputs(cfg: GeneratorConfig) -> None:
-    random.seed(cfg.seed)
-    np.random.seed(cfg.seed)
+    rng = np.random.default_rng(cfg.seed)
     ensure_out(cfg.out_dir)
+    table_ext, events_ext = OUTPUT_EXTENSIONS[cfg.format]
 
-    users_df = generate_users(cfg)
-    videos_df = generate_videos(cfg)
-    devices_df = generate_devices()
-    events = generate_events(cfg, users_df, videos_df)
+    users = generate_users(cfg, rng)
+    videos = generate_videos(cfg, rng)
+    devices = generate_devices()
 
-    users_df.to_csv(cfg.out_dir / "users.csv", index=False)
-    videos_df.to_csv(cfg.out_dir / "videos.csv", index=False)
-    devices_df.to_csv(cfg.out_dir / "devices.csv", index=False)
+    users_path = cfg.out_dir / f"users.{table_ext}"
+    videos_path = cfg.out_dir / f"videos.{table_ext}"
+    devices_path = cfg.out_dir / f"devices.{table_ext}"
+    write_table(users, users_path, cfg.format)
+    write_table(videos, videos_path, cfg.format)
+    write_table(devices, devices_path, cfg.format)
 
-    events_path = cfg.out_dir / "events.jsonl"
-    with open(events_path, "w", encoding="utf-8") as f:
-        for row in events:
-            f.write(json.dumps(row) + "\n")
+    events_path = cfg.out_dir / f"events.{events_ext}{COMPRESS_SUFFIXES[cfg.compress]}"
+    write_events(generate_events(cfg, users, videos), events_path, cfg.format, cfg.compress)
 
     print(f"Wrote: {events_path}")
-    print(f"Wrote: {cfg.out_dir / 'users.csv'}")
-    print(f"Wrote: {cfg.out_dir / 'videos.csv'}")
-    print(f"Wrote: {cfg.out_dir / 'devices.csv'}")
+    print(f"Wrote: {users_path}")
+    print(f"Wrote: {videos_path}")
+    print(f"Wrote: {devices_path}")
 
 
 def parse_args() -> GeneratorConfig:
@@ -524,8 +554,44 @@ def parse_args() -> GeneratorConfig:
     parser.add_argument("--users", type=int, default=300, help="Number of users to generate")
     parser.add_argument("--videos", type=int, default=80, help="Number of videos to generate")
     parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    parser.add_argument(
+        "--format",
+        choices=sorted(OUTPUT_EXTENSIONS),
+        default="jsonl",
+        help="Output format: jsonl (CSV dimensions + NDJSON events), csv, parquet or feather",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Worker processes for event generation (default: CPU count)",
+    )
+    parser.add_argument(
+        "--compress",
+        choices=sorted(COMPRESS_SUFFIXES),
+        default="none",
+        help="Streaming compression for jsonl/csv events (Parquet and Feather compress internally)",
+    )
     args = parser.parse_args()
-    return GeneratorConfig(out_dir=Path(args.out_dir), days=args.days, users=args.users, videos=args.videos, seed=args.seed)
+    if args.videos < 1:
+        parser.error("--videos must be at least 1; watch_time and like events need a video")
+    if args.format in ("parquet", "feather"):
+        if importlib.util.find_spec("pyarrow") is None:
+            parser.error(f"--format {args.format} requires pyarrow")
+        if args.compress != "none":
+            parser.error(f"--compress applies to jsonl/csv events, not --format {args.format}")
+    if args.compress == "zstd" and importlib.util.find_spec("zstandard") is None:
+        parser.error("--compress zstd requires zstandard")
+    return GeneratorConfig(
+        out_dir=Path(args.out_dir),
+        days=args.days,
+        users=args.users,
+        videos=args.videos,
+        seed=args.seed,
+        format=args.format,
+        workers=args.workers,
+        compress=args.compress,
+    )
 
 
 def main() -> None:
@@ -535,5 +601,3 @@ def main() -> None:
 
 if __name__ == "__main__":
     main()
-
-